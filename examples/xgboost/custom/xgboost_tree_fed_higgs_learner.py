@@ -31,6 +31,7 @@ class XGBoostTreeFedHiggsLearner(XGBoostTreeFedLearner):
         data_split_filename,
         training_mode,
         num_tree_bagging: int = 1,
+        scalars_per_flush: int = 10,
         lr_mode: str = "uniform",
         local_model_path: str = "model.json",
         global_model_path: str = "model_global.json",
@@ -45,6 +46,7 @@ class XGBoostTreeFedHiggsLearner(XGBoostTreeFedLearner):
         super().__init__(
             training_mode=training_mode,
             num_tree_bagging=num_tree_bagging,
+            scalars_per_flush=scalars_per_flush,
             lr_mode=lr_mode,
             local_model_path=local_model_path,
             global_model_path=global_model_path,
@@ -13,9 +13,13 @@
 # limitations under the License.
 
 import argparse
-import json
 import os
 import shutil
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import orjson
+import yaml
 
 
 def job_config_args_parser():
@@ -32,24 +36,35 @@ def job_config_args_parser():
     parser.add_argument(
         "--tree_method", type=str, default="hist", help="tree_method for xgboost - use hist or gpu_hist for best perf"
     )
+    parser.add_argument("--pretty_json", action="store_true", help="Write indented json configs for readability")
+    parser.add_argument(
+        "--batch_spec",
+        type=str,
+        default=None,
+        help="Path to a yaml list of argument overrides, one entry per job config to generate",
+    )
     return parser
 
 
+@lru_cache(maxsize=32)
+def _read_file_cached(filename):
+    with open(filename, "rb") as f:
+        return f.read()
+
+
 def read_json(filename):
     assert os.path.isfile(filename), f"{filename} does not exist!"
-    with open(filename, "r") as f:
-        return json.load(f)
+    # parse the cached bytes on every call, callers mutate the returned dict
+    return orjson.loads(_read_file_cached(filename))
 
 
-def write_json(data, filename):
-    with open(filename, "w") as f:
-        json.dump(data, f, indent=4)
+def write_json(data, filename, pretty=False):
+    with open(filename, "wb", buffering=1 << 16) as f:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0))
 
 
-def main():
-    parser = job_config_args_parser()
-    args = parser.parse_args()
-    job_name = (
+def get_job_name(args):
+    return (
         "higgs_"
         + str(args.site_num)
         + "_"
@@ -61,31 +76,59 @@ def main():
         + args.lr_mode
         + "_lr"
     )
+
+
+def read_batch_spec(args, parser):
+    with open(args.batch_spec, "r") as f:
+        specs = yaml.safe_load(f)
+    assert isinstance(specs, list), f"{args.batch_spec} must contain a list of job specs!"
+    arg_types = {action.dest: action.type for action in parser._actions if action.type}
+
+    job_args_list = []
+    spec_ids_by_job_name = {}
+    for i, spec in enumerate(specs):
+        assert isinstance(spec, dict), f"job spec #{i} in {args.batch_spec} must be a dict but got {type(spec)}!"
+        unknown = set(spec) - set(vars(args))
+        assert not unknown, f"unknown arguments {sorted(unknown)} in {args.batch_spec}"
+        job_args = argparse.Namespace(**vars(args))
+        for k, v in spec.items():
+            if k in arg_types:
+                try:
+                    v = arg_types[k](v)
+                except (TypeError, ValueError):
+                    raise ValueError(f"invalid value {v!r} for {k} in job spec #{i} of {args.batch_spec}")
+            setattr(job_args, k, v)
+        job_args_list.append(job_args)
+        spec_ids_by_job_name.setdefault(get_job_name(job_args), []).append(i)
+
+    # jobs with the same name write the same files, and are generated in parallel
+    clashes = {name: ids for name, ids in spec_ids_by_job_name.items() if len(ids) > 1}
+    assert not clashes, f"job specs in {args.batch_spec} generate the same job configs: {clashes}"
+    return job_args_list
+
+
+def generate_job_config(args):
+    job_name = get_job_name(args)
     data_split_name = "data_split_" + str(args.site_num) + "_" + args.split_method + ".json"
     target_path = os.path.join(args.job_config_path_root, job_name)
     target_config_path = os.path.join(target_path, job_name, "config")
     base_path = os.path.join(args.job_config_path_root, args.base_job_name)
 
     # make target config folders
-    if not os.path.exists(target_config_path):
-        os.makedirs(target_config_path)
-    # copy files
+    os.makedirs(target_config_path, exist_ok=True)
     meta_config_filename = os.path.join(target_path, "meta.json")
     client_config_filename = os.path.join(target_config_path, "config_fed_client.json")
     server_config_filename = os.path.join(target_config_path, "config_fed_server.json")
     data_split_filename = os.path.join(target_config_path, data_split_name)
-    shutil.copyfile(os.path.join(base_path, "meta.json"), meta_config_filename)
-    shutil.copyfile(os.path.join(base_path, "higgs_base/config", "config_fed_client.json"), client_config_filename)
-    shutil.copyfile(
-        os.path.join(base_path, "higgs_base/config", "config_fed_server_" + args.training_mode + ".json"),
-        server_config_filename,
-    )
+    # data split is copied as-is, configs are read from the base job and written once below
     shutil.copyfile(os.path.join(args.data_split_path, data_split_name), data_split_filename)
 
     # adjust file contents according to each job's specs
-    meta_config = read_json(meta_config_filename)
-    client_config = read_json(client_config_filename)
-    server_config = read_json(server_config_filename)
+    meta_config = read_json(os.path.join(base_path, "meta.json"))
+    client_config = read_json(os.path.join(base_path, "higgs_base/config", "config_fed_client.json"))
+    server_config = read_json(
+        os.path.join(base_path, "higgs_base/config", "config_fed_server_" + args.training_mode + ".json")
+    )
     # update meta
     meta_config["name"] = job_name
     meta_config["deploy_map"][job_name] = meta_config["deploy_map"][args.base_job_name]
@@ -109,9 +152,23 @@ def main():
         print(f"Training mode {args.training_mode} not supported")
         return False
     # write jsons
-    write_json(meta_config, meta_config_filename)
-    write_json(client_config, client_config_filename)
-    write_json(server_config, server_config_filename)
+    write_json(meta_config, meta_config_filename, args.pretty_json)
+    write_json(client_config, client_config_filename, args.pretty_json)
+    write_json(server_config, server_config_filename, args.pretty_json)
+    return True
+
+
+def main():
+    parser = job_config_args_parser()
+    args = parser.parse_args()
+    if not args.batch_spec:
+        return generate_job_config(args)
+
+    job_args_list = read_batch_spec(args, parser)
+    if not job_args_list:
+        return True
+    with ProcessPoolExecutor(max_workers=min(len(job_args_list), os.cpu_count() or 1)) as executor:
+        return all(executor.map(generate_job_config, job_args_list))
 
 
 if __name__ == "__main__":
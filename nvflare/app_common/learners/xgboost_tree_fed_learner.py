@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import json
+import logging
 import os
 from abc import abstractmethod
 
@@ -27,13 +28,45 @@ from nvflare.apis.signal import Signal
 from nvflare.app_common.abstract.learner_spec import Learner
 from nvflare.app_common.app_constant import AppConstants
 from nvflare.app_common.shareablegenerators.xgb_model_shareable_generator import update_model
+from nvflare.fuel.utils.import_utils import optional_import
+
+# orjson is optional, the standard json module is used when it is not installed
+orjson, _HAS_ORJSON = optional_import(module="orjson")
+
+
+def _json_loads(data):
+    return orjson.loads(data) if _HAS_ORJSON else json.loads(data)
+
+
+def _json_dumps(obj) -> bytes:
+    return orjson.dumps(obj) if _HAS_ORJSON else json.dumps(obj).encode("utf-8")
 
 
 class XGBoostTreeFedLearner(Learner):
+    """Learner for federated XGBoost tree-based training, in bagging or cyclic mode.
+
+    Args:
+        training_mode: "bagging" or "cyclic"
+        num_tree_bagging: number of trees aggregated per round in bagging mode
+        scalars_per_flush: number of rounds whose tensorboard scalars are buffered before being written.
+            Use 1 to see the validation AUC of every round as soon as it is computed.
+        lr_mode: "uniform" or "scaled" shrinkage across sites
+        local_model_path: file name of the local model within the app folder
+        global_model_path: file name of the global model within the app folder
+        learning_rate: base learning rate
+        objective: xgboost objective
+        max_depth: xgboost max_depth
+        eval_metric: xgboost eval_metric
+        nthread: xgboost nthread
+        tree_method: xgboost tree_method
+        train_task_name: name of the train task
+    """
+
     def __init__(
         self,
         training_mode,
         num_tree_bagging: int = 1,
+        scalars_per_flush: int = 10,
         lr_mode: str = "uniform",
         local_model_path: str = "model.json",
         global_model_path: str = "model_global.json",
@@ -48,6 +81,7 @@ class XGBoostTreeFedLearner(Learner):
         super().__init__()
         self.training_mode = training_mode
         self.num_tree_bagging = num_tree_bagging
+        self.scalars_per_flush = scalars_per_flush
         self.lr_mode = lr_mode
         self.local_model_path = local_model_path
         self.global_model_path = global_model_path
@@ -61,6 +95,8 @@ class XGBoostTreeFedLearner(Learner):
         # Currently we support boosting 1 tree per round
         # could further extend
         self.trees_per_round = 1
+        # tensorboard scalars are buffered and written every scalars_per_flush rounds
+        self._pending_scalars = []
 
     def initialize(self, parts: dict, fl_ctx: FLContext):
         # when a run starts, this is where the actual settings get initialized for learner
@@ -75,10 +111,11 @@ class XGBoostTreeFedLearner(Learner):
         # get and print the args
         fl_args = fl_ctx.get_prop(FLContextKey.ARGS)
         self.client_id = fl_ctx.get_identity_name()
-        self.log_info(
-            fl_ctx,
-            f"Client {self.client_id} initialized with args: \n {fl_args}",
-        )
+        if self.logger.isEnabledFor(logging.INFO):
+            self.log_info(
+                fl_ctx,
+                f"Client {self.client_id} initialized with args: \n {fl_args}",
+            )
 
         # set local tensorboard writer for local training info of current model
         self.writer = SummaryWriter(app_dir)
@@ -103,6 +140,7 @@ class XGBoostTreeFedLearner(Learner):
         self.set_lr()
         self.bst = None
         self.global_model_as_dict = None
+        self.config = None
 
     def set_lr(self):
         if self.training_mode == "bagging":
@@ -117,6 +155,16 @@ class XGBoostTreeFedLearner(Learner):
             # Cyclic mode, directly use the base learning_rate
             self.lr = self.base_lr
 
+        # training parameters do not change across rounds, build them once
+        self._param = {
+            "objective": self.objective,
+            "eta": self.lr,
+            "max_depth": self.max_depth,
+            "eval_metric": self.eval_metric,
+            "nthread": self.nthread,
+            "tree_method": self.tree_method,
+        }
+
     @abstractmethod
     def load_data(self, fl_ctx: FLContext):
         """Load data customized to individual tasks
@@ -127,58 +175,88 @@ class XGBoostTreeFedLearner(Learner):
         self.dmat_valid: xgb.DMatrix
         self.valid_y: array for validation metric computation
         self.lr_scale: scale factor needed for site-wise learning rate adjustment
+        Preferably build the DMatrix objects through _load_or_cache_dmatrix,
+        so that restarted jobs load xgboost's binary cache instead of re-parsing the source data
         """
         raise NotImplementedError
 
+    def _load_or_cache_dmatrix(self, src_path: str, cache_path: str, build_fn) -> xgb.DMatrix:
+        """Load a DMatrix from its binary cache, or build it from source and save the cache.
+
+        The cache is rebuilt when the source data is newer than it, or when it cannot be loaded.
+        It is written to a temporary file first, so an interrupted write never leaves a truncated cache.
+
+        Args:
+            src_path: path of the source data
+            cache_path: path of the xgboost binary DMatrix cache
+            build_fn: callable taking src_path and returning a DMatrix
+
+        Returns:
+            the loaded DMatrix
+        """
+        if os.path.isfile(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(src_path):
+            try:
+                return xgb.DMatrix(cache_path)
+            except xgb.core.XGBoostError:
+                self.logger.warning(f"cannot load DMatrix cache {cache_path}, rebuilding it from {src_path}")
+
+        dmat = build_fn(src_path)
+        tmp_path = cache_path + ".tmp"
+        dmat.save_binary(tmp_path)
+        os.replace(tmp_path, cache_path)
+        return dmat
+
     def get_training_parameters_single(self):
-        param = {}
-        param["objective"] = self.objective
-        param["eta"] = self.lr
-        param["max_depth"] = self.max_depth
-        param["eval_metric"] = self.eval_metric
-        param["nthread"] = self.nthread
-        param["tree_method"] = self.tree_method
-        return param
+        return self._param
 
     def local_boost_bagging(self, param, fl_ctx: FLContext):
+        num_rounds = self.bst.num_boosted_rounds()
         eval_results = self.bst.eval_set(
-            evals=[(self.dmat_train, "train"), (self.dmat_valid, "valid")], iteration=self.bst.num_boosted_rounds() - 1
+            evals=[(self.dmat_train, "train"), (self.dmat_valid, "valid")], iteration=num_rounds - 1
         )
-        self.log_info(fl_ctx, eval_results)
-        auc = float(eval_results.split("\t")[2].split(":")[1])
+        if self.logger.isEnabledFor(logging.INFO):
+            self.log_info(fl_ctx, eval_results)
+        # eval_results is "[i]\ttrain-auc:x\tvalid-auc:y", the validation metric is the last value
+        auc = float(eval_results.rpartition(":")[2])
         for i in range(self.trees_per_round):
-            self.bst.update(self.dmat_train, self.bst.num_boosted_rounds())
+            self.bst.update(self.dmat_train, num_rounds + i)
 
         # extract newly added self.trees_per_round using xgboost slicing api
-        bst = self.bst[self.bst.num_boosted_rounds() - self.trees_per_round : self.bst.num_boosted_rounds()]
+        bst = self.bst[num_rounds : num_rounds + self.trees_per_round]
 
         self.log_info(
             fl_ctx,
             f"Global AUC {auc}",
         )
         # note: writing auc before current training step, for passed in global model
-        self.writer.add_scalar(
-            "AUC", auc, int((self.bst.num_boosted_rounds() - self.trees_per_round - 1) / self.num_tree_bagging)
-        )
+        self._pending_scalars.append((auc, int((num_rounds - 1) / self.num_tree_bagging)))
         return bst
 
     def local_boost_cyclic(self, param, fl_ctx: FLContext):
         # Cyclic mode
         # starting from global model
         # return the whole boosting tree series
-        self.bst.update(self.dmat_train, self.bst.num_boosted_rounds())
+        num_rounds = self.bst.num_boosted_rounds()
+        self.bst.update(self.dmat_train, num_rounds)
         eval_results = self.bst.eval_set(
-            evals=[(self.dmat_train, "train"), (self.dmat_valid, "valid")], iteration=self.bst.num_boosted_rounds() - 1
+            evals=[(self.dmat_train, "train"), (self.dmat_valid, "valid")], iteration=num_rounds
         )
-        self.log_info(fl_ctx, eval_results)
-        auc = float(eval_results.split("\t")[2].split(":")[1])
+        if self.logger.isEnabledFor(logging.INFO):
+            self.log_info(fl_ctx, eval_results)
+        auc = float(eval_results.rpartition(":")[2])
         self.log_info(
             fl_ctx,
             f"Client {self.client_id} AUC after training: {auc}",
         )
-        self.writer.add_scalar("AUC", auc, self.bst.num_boosted_rounds() - 1)
+        self._pending_scalars.append((auc, num_rounds))
         return self.bst
 
+    def _flush_scalars(self):
+        for auc, step in self._pending_scalars:
+            self.writer.add_scalar("AUC", auc, step)
+        self._pending_scalars = []
+        self.writer.flush()
+
     def train(
         self,
         shareable: Shareable,
@@ -195,7 +273,7 @@ class XGBoostTreeFedLearner(Learner):
         model_update = dxo.data
 
         # xgboost parameters
-        param = self.get_training_parameters_single()
+        param = self._param
 
         if not self.bst:
             # First round
@@ -228,10 +306,11 @@ class XGBoostTreeFedLearner(Learner):
             )
             if self.training_mode == "bagging":
                 model_updates = model_update["model_data"]
-                for update in model_updates:
-                    self.global_model_as_dict = update_model(self.global_model_as_dict, json.loads(update))
+                # json parsing holds the GIL, so updates are decoded serially
+                for update in map(_json_loads, model_updates):
+                    self.global_model_as_dict = update_model(self.global_model_as_dict, update)
 
-                loadable_model = bytearray(json.dumps(self.global_model_as_dict), "utf-8")
+                loadable_model = bytearray(_json_dumps(self.global_model_as_dict))
             else:
                 loadable_model = bytearray(model_update["model_data"])
 
@@ -254,6 +333,8 @@ class XGBoostTreeFedLearner(Learner):
             elif self.training_mode == "cyclic":
                 bst = self.local_boost_cyclic(param, fl_ctx)
 
+        # the model must stay in json: the bagging aggregator, XGBModelShareableGenerator and
+        # JSONModelPersistor on the server merge and persist trees as parsed json without xgboost
         self.local_model = bst.save_raw("json")
 
         # report updated model in shareable
@@ -262,10 +343,12 @@ class XGBoostTreeFedLearner(Learner):
         self.log_info(fl_ctx, "Local epochs finished. Returning shareable")
         new_shareable = dxo.to_shareable()
 
-        self.writer.flush()
+        if len(self._pending_scalars) >= self.scalars_per_flush:
+            self._flush_scalars()
         return new_shareable
 
     def finalize(self, fl_ctx: FLContext):
+        self._flush_scalars()
         # freeing resources in finalize avoids seg fault during shutdown of gpu mode
         del self.bst
         del self.dmat_train
@@ -15,6 +15,8 @@
 import random
 from typing import Tuple
 
+import numpy as np
+
 from nvflare.apis.fl_component import FLComponent
 from nvflare.app_common.app_constant import StatisticsConstants as StC
 from nvflare.app_common.statistics.metrics_privacy_cleanser import MetricsPrivacyCleanser
@@ -41,19 +43,21 @@ class AddNoiseToMinMax(FLComponent, MetricsPrivacyCleanser):
         super().__init__()
         self.noise_level = (min_noise_level, max_noise_level)
         self.noise_generators = {
-            StC.STATS_MIN: AddNoiseToMinMax._get_min_value,
-            StC.STATS_MAX: AddNoiseToMinMax._get_max_value,
+            StC.STATS_MIN: AddNoiseToMinMax._get_min_values,
+            StC.STATS_MAX: AddNoiseToMinMax._get_max_values,
         }
         self.validate_inputs()
+        self._rng = np.random.default_rng()
+        # with zero noise only 0 values change (to -/+1e-5), no random draw is needed
+        self._zero_noise = self.noise_level == (0.0, 0.0)
 
     def validate_inputs(self):
-        for i in range(0, 2):
-            if self.noise_level[i] < 0 or self.noise_level[i] > 1.0:
-                raise ValueError(f"noise_level {self.noise_level}  is not within (0, 1)")
-        if self.noise_level[0] > self.noise_level[1]:
+        min_noise_level, max_noise_level = self.noise_level
+        if not (0 <= min_noise_level <= 1.0 and 0 <= max_noise_level <= 1.0):
+            raise ValueError(f"noise_level {self.noise_level}  is not within (0, 1)")
+        if min_noise_level > max_noise_level:
             raise ValueError(
-                f"minimum noise level {self.noise_level[0]} should be less "
-                f"than maximum noise level {self.noise_level[1]}"
+                f"minimum noise level {min_noise_level} should be less than maximum noise level {max_noise_level}"
             )
 
     @staticmethod
@@ -82,13 +86,42 @@ class AddNoiseToMinMax(FLComponent, MetricsPrivacyCleanser):
 
         return max_value
 
+    @staticmethod
+    def _get_min_values(local_min_values: np.ndarray, r: np.ndarray) -> np.ndarray:
+        # vectorized _get_min_value: positive values shrink by (1 - r), negative values grow by (1 + r)
+        return np.where(
+            local_min_values == 0,
+            -(1 - r) * 1e-5,
+            local_min_values * (1 - np.sign(local_min_values) * r),
+        )
+
+    @staticmethod
+    def _get_max_values(local_max_values: np.ndarray, r: np.ndarray) -> np.ndarray:
+        # vectorized _get_max_value: positive values grow by (1 + r), negative values shrink by (1 - r)
+        return np.where(
+            local_max_values == 0,
+            (1 + r) * 1e-5,
+            local_max_values * (1 + np.sign(local_max_values) * r),
+        )
+
     def generate_noise(self, metrics: dict, metric) -> dict:
         noise_gen = self.noise_generators[metric]
-        for ds_name in metrics[metric]:
-            for feature_name in metrics[metric][ds_name]:
-                local_value = metrics[metric][ds_name][feature_name]
-                noise_value = noise_gen(local_value, self.noise_level)
-                metrics[metric][ds_name][feature_name] = noise_value
+        min_noise_level, max_noise_level = self.noise_level
+        features = [(ds_values, feature_name) for ds_values in metrics[metric].values() for feature_name in ds_values]
+        if not features:
+            return metrics
+
+        local_values = np.fromiter(
+            (ds_values[feature_name] for ds_values, feature_name in features),
+            dtype=np.float64,
+            count=len(features),
+        )
+        if self._zero_noise:
+            r = 0.0
+        else:
+            r = self._rng.uniform(min_noise_level, max_noise_level, size=local_values.size)
+        for (ds_values, feature_name), noise_value in zip(features, noise_gen(local_values, r).tolist()):
+            ds_values[feature_name] = noise_value
         return metrics
 
     def apply(self, metrics: dict, client_name: str) -> Tuple[dict, bool]:
@@ -12,22 +12,31 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import hashlib
+import importlib.util
+import json
+import sys
+import threading
 import time
+from collections import OrderedDict
 
 _KEY_PERMISSIONS = "permissions"
 _KEY_FORMAT_VERSION = "format_version"
 _TARGET_SITE = "site"
 _TARGET_SUBMITTER = "submitter"
 _ANY_RIGHT = "*"
+_DECISION_CACHE_SIZE = 10000
 
 
 class Person(object):
+    __slots__ = ("name", "org", "roles", "role_set")
+
     def __init__(self, name: str, org: str, role):
         self.name = _normalize_str(name)
         self.org = _normalize_str(org)
-        self.roles = []
+        roles = []
         if isinstance(role, str):
-            self.roles.append(_normalize_str(role))
+            roles.append(_normalize_str(role))
         elif isinstance(role, list):
             if len(role) <= 0:
                 raise TypeError("roles not specified - it must be a list of strings")
@@ -35,37 +44,65 @@ class Person(object):
             for r in role:
                 if not isinstance(r, str):
                     raise TypeError(f"role value must be a str but got {type(r)}")
-                self.roles.append(_normalize_str(r))
+                roles.append(_normalize_str(r))
         else:
             raise TypeError(f"role must be a str or list of str but got {type(role)}")
+        self.roles = tuple(roles)
+        self.role_set = frozenset(roles)
 
     def __str__(self):
         return f"{self.name}:{self.org}:{self.roles[0]}"
 
 
 class AuthzContext(object):
+    __slots__ = ("right", "user", "submitter", "attrs")
+
     def __init__(self, right: str, user: Person, submitter: Person = None):
         """Base class to contain context data for authorization."""
-        self.right = right
+        self.right = _normalize_str(right)
         self.user = user
         self.submitter = submitter
-        self.attrs = {}
+        # attrs dict is only created when the first attr is set
+        self.attrs = None
         if not submitter:
             self.submitter = Person("", "", "")
 
     def set_attr(self, key: str, value):
+        if self.attrs is None:
+            self.attrs = {}
         self.attrs[key] = value
 
     def get_attr(self, key: str, default=None):
+        if self.attrs is None:
+            return default
         return self.attrs.get(key, default)
 
 
 class ConditionEvaluator(object):
+    __slots__ = ()
+
     def evaluate(self, site_org: str, ctx: AuthzContext) -> bool:
         pass
 
+    def get_source(self, consts: dict) -> str:
+        """Get a python expression equivalent to evaluate, for compiling conditions into one function.
+
+        The expression can refer to "site_org" and "ctx". Any other value must be added to consts
+        and referred to by its key.
+
+        Args:
+            consts: names of constant values used by the expression
+
+        Returns: source of the expression
+
+        """
+        name = _add_const(self, consts)
+        return f"{name}.evaluate(site_org, ctx)"
+
 
 class UserOrgEvaluator(ConditionEvaluator):
+    __slots__ = ("target",)
+
     def __init__(self, target):
         self.target = target
 
@@ -77,8 +114,18 @@ class UserOrgEvaluator(ConditionEvaluator):
         else:
             return ctx.user.org == self.target
 
+    def get_source(self, consts: dict) -> str:
+        if self.target == _TARGET_SITE:
+            return "ctx.user.org == site_org"
+        elif self.target == _TARGET_SUBMITTER:
+            return "ctx.user.org == ctx.submitter.org"
+        else:
+            return f"ctx.user.org == {_add_const(self.target, consts)}"
+
 
 class UserNameEvaluator(ConditionEvaluator):
+    __slots__ = ("target",)
+
     def __init__(self, target: str):
         self.target = target
 
@@ -88,53 +135,144 @@ class UserNameEvaluator(ConditionEvaluator):
         else:
             return ctx.user.name == self.target
 
+    def get_source(self, consts: dict) -> str:
+        if self.target == _TARGET_SUBMITTER:
+            return "ctx.user.name == ctx.submitter.name"
+        else:
+            return f"ctx.user.name == {_add_const(self.target, consts)}"
+
+
+# Specialized evaluators picked at parse time, so that evaluate does not branch on the target.
+# UserOrgEvaluator and UserNameEvaluator are kept as their base types.
+
+
+class _UserOrgSiteEvaluator(UserOrgEvaluator):
+    __slots__ = ()
+
+    def __init__(self):
+        UserOrgEvaluator.__init__(self, _TARGET_SITE)
+
+    def evaluate(self, site_org: str, ctx: AuthzContext):
+        return ctx.user.org == site_org
+
+    def get_source(self, consts: dict) -> str:
+        return "ctx.user.org == site_org"
+
+
+class _UserOrgSubmitterEvaluator(UserOrgEvaluator):
+    __slots__ = ()
+
+    def __init__(self):
+        UserOrgEvaluator.__init__(self, _TARGET_SUBMITTER)
+
+    def evaluate(self, site_org: str, ctx: AuthzContext):
+        return ctx.user.org == ctx.submitter.org
+
+    def get_source(self, consts: dict) -> str:
+        return "ctx.user.org == ctx.submitter.org"
+
+
+class _UserOrgLiteralEvaluator(UserOrgEvaluator):
+    __slots__ = ()
+
+    def evaluate(self, site_org: str, ctx: AuthzContext):
+        return ctx.user.org == self.target
+
+    def get_source(self, consts: dict) -> str:
+        return f"ctx.user.org == {_add_const(self.target, consts)}"
+
+
+class _UserNameSubmitterEvaluator(UserNameEvaluator):
+    __slots__ = ()
+
+    def __init__(self):
+        UserNameEvaluator.__init__(self, _TARGET_SUBMITTER)
+
+    def evaluate(self, site_org: str, ctx: AuthzContext):
+        return ctx.user.name == ctx.submitter.name
+
+    def get_source(self, consts: dict) -> str:
+        return "ctx.user.name == ctx.submitter.name"
+
+
+class _UserNameLiteralEvaluator(UserNameEvaluator):
+    __slots__ = ()
+
+    def evaluate(self, site_org: str, ctx: AuthzContext):
+        return ctx.user.name == self.target
+
+    def get_source(self, consts: dict) -> str:
+        return f"ctx.user.name == {_add_const(self.target, consts)}"
+
 
 class TrueEvaluator(ConditionEvaluator):
+    __slots__ = ()
+
     def evaluate(self, site_org: str, ctx: AuthzContext) -> bool:
         return True
 
+    def get_source(self, consts: dict) -> str:
+        return "True"
+
 
 class FalseEvaluator(ConditionEvaluator):
+    __slots__ = ()
+
     def evaluate(self, site_org: str, ctx: AuthzContext) -> bool:
         return False
 
+    def get_source(self, consts: dict) -> str:
+        return "False"
+
 
 class _RoleRightConditions(object):
+    __slots__ = ("allowed_conditions", "blocked_conditions", "allow_all", "deny_all", "exp", "eval_func")
+
     def __init__(self):
         self.allowed_conditions = []
         self.blocked_conditions = []
+        # "all"/"any" conditions are kept as flags instead of TrueEvaluators
+        self.allow_all = False
+        self.deny_all = False
         self.exp = None
+        self.eval_func = None
 
-    def _any_condition_matched(self, conds: [ConditionEvaluator], site_org: str, ctx: AuthzContext):
-        # if any condition is met, return True
-        # only when all conditions fail to match, return False
-        for e in conds:
-            matched = e.evaluate(site_org, ctx)
-            if matched:
-                return True
-        return False
+    def get_source(self, consts: dict) -> str:
+        if self.deny_all:
+            return "False"
 
-    def evaluate(self, site_org: str, ctx: AuthzContext):
-        # first evaluate blocked list
-        if self.blocked_conditions:
-            if self._any_condition_matched(self.blocked_conditions, site_org, ctx):
-                # if any block condition is met, return False
-                # print("blocked")
-                return False
-
-        # evaluate allowed list
-        if self.allowed_conditions:
-            if self._any_condition_matched(self.allowed_conditions, site_org, ctx):
-                # print("allowed")
-                return True
-            else:
-                # all allowed conditions failed
-                # print("not allowed")
-                return False
+        if self.allow_all and not self.blocked_conditions:
+            return "True"
 
-        # no allowed list specified - only blocked list specified
-        # we got here since no blocked condition matched
-        return True
+        # blocked and allowed conditions as a single short-circuited expression:
+        # not blocked, and allowed if any allowed condition is specified
+        blocked = _get_conditions_source(self.blocked_conditions, consts)
+        if self.allow_all:
+            allowed = ""
+        else:
+            allowed = _get_conditions_source(self.allowed_conditions, consts)
+        if not blocked:
+            return allowed or "True"
+        if not allowed:
+            return f"not ({blocked})"
+        return f"not ({blocked}) and ({allowed})"
+
+    def _compile(self):
+        if self.deny_all:
+            self.eval_func = _deny_all
+            return
+
+        if self.allow_all and not self.blocked_conditions:
+            self.eval_func = _allow_all
+            return
+
+        consts = {}
+        code = compile(f"lambda site_org, ctx: {self.get_source(consts)}", "<authz conditions>", "eval")
+        consts["__builtins__"] = {}
+        self.eval_func = eval(code, consts)
+
+    def evaluate(self, site_org: str, ctx: AuthzContext):
+        return self.eval_func(site_org, ctx)
 
     def _parse_one_expression(self, exp) -> str:
         v = _normalize_str(exp)
@@ -145,7 +283,11 @@ class _RoleRightConditions(object):
             v = parts[1]
 
         if v in ["all", "any"]:
-            ev = TrueEvaluator()
+            if blocked:
+                self.deny_all = True
+            else:
+                self.allow_all = True
+            return ""
         elif v in ["none", "no"]:
             ev = FalseEvaluator()
         else:
@@ -155,9 +297,17 @@ class _RoleRightConditions(object):
                 target_value = _normalize_str(parts[1])
 
                 if target_type in ["o", "org"]:
-                    ev = UserOrgEvaluator(target_value)
+                    if target_value == _TARGET_SITE:
+                        ev = _UserOrgSiteEvaluator()
+                    elif target_value == _TARGET_SUBMITTER:
+                        ev = _UserOrgSubmitterEvaluator()
+                    else:
+                        ev = _UserOrgLiteralEvaluator(target_value)
                 elif target_type in ["n", "name"]:
-                    ev = UserNameEvaluator(target_value)
+                    if target_value == _TARGET_SUBMITTER:
+                        ev = _UserNameSubmitterEvaluator()
+                    else:
+                        ev = _UserNameLiteralEvaluator(target_value)
                 else:
                     return f'bad condition expression "{exp}": invalid type "{target_type}"'
             else:
@@ -184,9 +334,10 @@ class _RoleRightConditions(object):
         """
         self.exp = exp
         if isinstance(exp, str):
-            return self._parse_one_expression(exp)
-
-        if isinstance(exp, list):
+            err = self._parse_one_expression(exp)
+            if err:
+                return err
+        elif isinstance(exp, list):
             # we expect the list contains str only
             if not exp:
                 # empty list
@@ -200,8 +351,12 @@ class _RoleRightConditions(object):
         else:
             return f"bad condition expression type - expect str or list but got {type(exp)}"
 
+        self._compile()
+
 
 class Policy(object):
+    __slots__ = ("config", "role_right_map", "roles", "rights", "role_rights")
+
     def __init__(self, config: dict, role_right_map: dict, roles: list, rights: list, role_rights: dict):
         self.config = config
         self.role_right_map = role_right_map
@@ -218,47 +373,71 @@ class Policy(object):
         return self.roles
 
     def _eval_for_role(self, role: str, site_org: str, ctx: AuthzContext):
-        conds = self.role_right_map.get(_role_right_key(role, _ANY_RIGHT))
-        if not conds:
-            conds = self.role_right_map.get(_role_right_key(role, ctx.right))
-
-        if not conds:
+        right_map = self.role_right_map.get(role)
+        if not right_map:
             return False
 
-        assert isinstance(conds, _RoleRightConditions)
-        return conds.evaluate(site_org, ctx)
+        eval_func = right_map.get(_ANY_RIGHT) or right_map.get(ctx.right)
+        return eval_func(site_org, ctx) if eval_func else False
 
     def evaluate(self, site_org: str, ctx: AuthzContext):
         """
 
         Args:
             site_org:
-            right: right to be evaluated
             ctx:
 
         Returns: a tuple of (result, error)
 
         """
-        site_org = _normalize_str(site_org)
-        for role in ctx.user.roles:
-            permitted = self._eval_for_role(role=role, site_org=site_org, ctx=ctx)
-            if permitted:
-                # permitted if any role is okay
-                return True, ""
-        return False, ""
+        return self._evaluate(_normalize_str(site_org), ctx)
+
+    def _evaluate(self, site_org: str, ctx: AuthzContext):
+        # site_org must be normalized already
+        # permitted if any role is okay
+        return any(self._eval_for_role(role, site_org, ctx) for role in ctx.user.roles), ""
 
 
 def _normalize_str(s: str) -> str:
-    return " ".join(s.lower().split())
+    # interned so that comparisons and lookups between normalized names hit the identity fast path
+    return sys.intern(" ".join(s.lower().split()))
+
+
+def _get_conditions_source(conds: [ConditionEvaluator], consts: dict) -> str:
+    # literal org and name conditions are merged into frozenset membership tests
+    orgs = [e.target for e in conds if isinstance(e, _UserOrgLiteralEvaluator)]
+    names = [e.target for e in conds if isinstance(e, _UserNameLiteralEvaluator)]
+    sources = []
+    if len(orgs) > 1:
+        sources.append(f"ctx.user.org in {_add_const(frozenset(orgs), consts)}")
+    if len(names) > 1:
+        sources.append(f"ctx.user.name in {_add_const(frozenset(names), consts)}")
+    for e in conds:
+        if len(orgs) > 1 and isinstance(e, _UserOrgLiteralEvaluator):
+            continue
+        if len(names) > 1 and isinstance(e, _UserNameLiteralEvaluator):
+            continue
+        sources.append(e.get_source(consts))
+    return " or ".join(sources)
+
+
+def _allow_all(site_org: str, ctx: AuthzContext) -> bool:
+    return True
 
 
-def _role_right_key(role_name: str, right_name: str):
-    return role_name + ":" + right_name
+def _deny_all(site_org: str, ctx: AuthzContext) -> bool:
+    return False
+
+
+def _add_const(value, consts: dict) -> str:
+    name = f"_c{len(consts)}"
+    consts[name] = value
+    return name
 
 
 def _add_role_right_conds(role, right, conds, rr_map: dict, rights, right_conds):
     right_conds[right] = conds.exp
-    rr_map[_role_right_key(role, right)] = conds
+    rr_map.setdefault(role, {})[right] = conds.eval_func
     if right not in rights:
         rights.append(right)
 
@@ -289,6 +468,9 @@ def parse_policy_config(config: dict, right_categories: dict):
     cat_to_rights = {}
     if right_categories:
         for r, c in right_categories.items():
+            # rights and categories are looked up by their normalized names
+            r = _normalize_str(r)
+            c = _normalize_str(c)
             right_list = cat_to_rights.get(c)
             if not right_list:
                 right_list = []
@@ -328,7 +510,9 @@ def parse_policy_config(config: dict, right_categories: dict):
         if not isinstance(right_conf, dict):
             return None, f"bad right config: expect a dict but got {type(right_conf)}"
 
-        # process right categories
+        # sort rights into categories and regular rights in one pass
+        cat_items = []
+        reg_items = []
         for right, exp in right_conf.items():
             if not isinstance(right, str):
                 return None, f"bad right name: expect a str but got {type(right)}"
@@ -337,10 +521,13 @@ def parse_policy_config(config: dict, right_categories: dict):
 
             # see whether this is a right category
             right_list = cat_to_rights.get(right)
-            if not right_list:
-                # this is a regular right - skip it
-                continue
+            if right_list:
+                cat_items.append((right, exp, right_list))
+            else:
+                reg_items.append((right, exp))
 
+        # process right categories
+        for right, exp, right_list in cat_items:
             conds = _RoleRightConditions()
             err = conds.parse_expression(exp)
             if err:
@@ -352,15 +539,7 @@ def parse_policy_config(config: dict, right_categories: dict):
                 _add_role_right_conds(role_name, r, conds, role_right_map, rights, right_conds)
 
         # process regular rights, which may override the rights from categories
-        for right, exp in right_conf.items():
-            right = _normalize_str(right)
-
-            # see whether this is a right category
-            right_list = cat_to_rights.get(right)
-            if right_list:
-                # this is category - already processed
-                continue
-
+        for right, exp in reg_items:
             conds = _RoleRightConditions()
             err = conds.parse_expression(exp)
             if err:
@@ -372,13 +551,79 @@ def parse_policy_config(config: dict, right_categories: dict):
     return Policy(config=config, role_right_map=role_right_map, role_rights=role_rights, roles=roles, rights=rights), ""
 
 
+def get_policy_hash(config: dict, right_categories: dict) -> str:
+    """Get the hash identifying a policy config together with the right categories it is parsed with."""
+    content = json.dumps({"config": config, "right_categories": right_categories}, sort_keys=True)
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def emit_policy_module(policy: Policy, right_categories: dict, path: str) -> str:
+    """Write the policy as a python module that Authorizer.load_compiled_policy can load.
+
+    The conditions of every role and right are emitted as lambdas, so loading the module
+    does not parse the policy config again.
+
+    Args:
+        policy: policy parsed by parse_policy_config
+        right_categories: the right categories the policy was parsed with
+        path: path of the module file to write
+
+    Returns: error string if the module cannot be written
+
+    """
+    lines = [
+        "# generated by nvflare.fuel.sec.authz.emit_policy_module - do not edit",
+        f"POLICY_HASH = {get_policy_hash(policy.config, right_categories)!r}",
+        f"CONFIG = {policy.config!r}",
+        f"ROLES = {policy.roles!r}",
+        f"RIGHTS = {policy.rights!r}",
+        f"ROLE_RIGHTS = {policy.role_rights!r}",
+        "ROLE_RIGHT_MAP = {",
+    ]
+    for role, right_conds in policy.role_rights.items():
+        lines.append(f"    {role!r}: {{")
+        for right, exp in right_conds.items():
+            conds = _RoleRightConditions()
+            err = conds.parse_expression(exp)
+            if err:
+                return err
+            consts = {}
+            source = conds.get_source(consts)
+            # constants are bound as default arguments of the lambda
+            args = "".join(f", {name}={value!r}" for name, value in consts.items())
+            lines.append(f"        {right!r}: lambda site_org, ctx{args}: {source},")
+        lines.append("    },")
+    lines.append("}")
+
+    try:
+        with open(path, "w") as f:
+            f.write("\n".join(lines) + "\n")
+    except OSError as e:
+        return f"cannot write compiled policy {path}: {e}"
+    return ""
+
+
 class Authorizer(object):
-    def __init__(self, site_org: str, right_categories: dict = None):
-        """Base class containing the authorization policy."""
+    def __init__(self, site_org: str, right_categories: dict = None, cache_decisions: bool = False):
+        """Base class containing the authorization policy.
+
+        Args:
+            site_org: org of the site the policy is enforced on
+            right_categories: categories of rights used to interpret the policy config
+            cache_decisions: whether to cache authorize decisions. A cached decision is assumed to depend
+                only on the right, the user's name, org and roles, the submitter's name and org, and the
+                loaded policy - not on ctx attrs. The cache is never used by subclasses that override
+                evaluate, since their decisions may depend on other inputs.
+
+        """
         self.site_org = _normalize_str(site_org)
         self.right_categories = right_categories
         self.policy = None
         self.last_load_time = None
+        self.cache_decisions = cache_decisions and type(self).evaluate is Authorizer.evaluate
+        # LRU cache of authorize decisions, reset whenever a policy is loaded
+        self._decision_cache = OrderedDict()
+        self._decision_cache_lock = threading.Lock()
 
     def get_policy(self) -> Policy:
         return self.policy
@@ -389,10 +634,32 @@ class Authorizer(object):
 
         assert isinstance(ctx, AuthzContext), f"ctx must be AuthzContext but got {type(ctx)}"
         assert isinstance(ctx.user, Person), "program error: no user in ctx!"
-        if "super" in ctx.user.roles:
+        if "super" in ctx.user.role_set:
             # use this for testing purpose
             return True, ""
 
+        if not self.cache_decisions:
+            return self._authorize(ctx)
+
+        # cached decisions only depend on these inputs and the policy
+        key = (ctx.right, ctx.user.name, ctx.user.org, ctx.user.roles, ctx.submitter.name, ctx.submitter.org)
+        with self._decision_cache_lock:
+            decision = self._decision_cache.get(key)
+            if decision is not None:
+                self._decision_cache.move_to_end(key)
+                return decision
+
+        policy = self.policy
+        decision = self._authorize(ctx)
+        with self._decision_cache_lock:
+            if self.policy is policy:
+                # don't cache a decision made with a policy that was replaced meanwhile
+                self._decision_cache[key] = decision
+                if len(self._decision_cache) > _DECISION_CACHE_SIZE:
+                    self._decision_cache.popitem(last=False)
+        return decision
+
+    def _authorize(self, ctx: AuthzContext) -> (bool, str):
         authorized, err = self.evaluate(ctx)
         if not authorized:
             if err:
@@ -406,7 +673,8 @@ class Authorizer(object):
         if not self.policy:
             return None, "policy not defined"
 
-        return self.policy.evaluate(ctx=ctx, site_org=self.site_org)
+        # site_org is normalized at construction
+        return self.policy._evaluate(site_org=self.site_org, ctx=ctx)
 
     def load_policy(self, policy_config: dict) -> str:
         policy, err = parse_policy_config(policy_config, self.right_categories)
@@ -414,32 +682,84 @@ class Authorizer(object):
             # this is an error
             return err
 
-        self.policy = policy
-        self.last_load_time = time.time()
+        self._set_policy(policy)
         return ""
 
+    def load_compiled_policy(self, path: str, policy_config: dict) -> str:
+        """Load the policy from a module generated by emit_policy_module, without parsing the policy config.
 
-class AuthorizationService(object):
+        The module is executed from path on every call, so a re-emitted module is always picked up.
+
+        Args:
+            path: path of the generated module file
+            policy_config: the policy config the module must have been generated from,
+                with this authorizer's right categories
+
+        Returns: error string if the module is not usable
+
+        """
+        if not isinstance(policy_config, dict):
+            return f"policy_config must be a dict but got {type(policy_config)}"
+
+        try:
+            spec = importlib.util.spec_from_file_location("_nvflare_compiled_policy", path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+        except Exception as e:
+            return f"cannot load compiled policy {path}: {e}"
+
+        attrs = {}
+        for name in ["POLICY_HASH", "CONFIG", "ROLES", "RIGHTS", "ROLE_RIGHTS", "ROLE_RIGHT_MAP"]:
+            attrs[name] = getattr(module, name, None)
+            if attrs[name] is None:
+                return f"compiled policy {path} is not a valid policy module"
+
+        if attrs["CONFIG"] != policy_config or attrs["POLICY_HASH"] != get_policy_hash(
+            policy_config, self.right_categories
+        ):
+            return f"compiled policy {path} is out of date"
+
+        policy = Policy(
+            config=attrs["CONFIG"],
+            role_right_map=attrs["ROLE_RIGHT_MAP"],
+            roles=list(attrs["ROLES"]),
+            rights=list(attrs["RIGHTS"]),
+            role_rights=attrs["ROLE_RIGHTS"],
+        )
+        self._set_policy(policy)
+        return ""
+
+    def _set_policy(self, policy: Policy):
+        with self._decision_cache_lock:
+            self.policy = policy
+            self._decision_cache.clear()
+        self.last_load_time = time.time()
 
-    the_authorizer = None
 
+# the authorizer is kept at module level so authorize() reads it with a single global lookup
+_the_authorizer = None
+
+
+class AuthorizationService(object):
     @staticmethod
     def initialize(authorizer: Authorizer) -> (Authorizer, str):
+        global _the_authorizer
         assert isinstance(authorizer, Authorizer), "authorizer must be Authorizer but got {}".format(type(authorizer))
 
-        if not AuthorizationService.the_authorizer:
+        if not _the_authorizer:
             # authorizer is not loaded
-            AuthorizationService.the_authorizer = authorizer
+            _the_authorizer = authorizer
 
-        return AuthorizationService.the_authorizer, ""
+        return _the_authorizer, ""
 
     @staticmethod
     def get_authorizer():
-        return AuthorizationService.the_authorizer
+        return _the_authorizer
 
     @staticmethod
     def authorize(ctx: AuthzContext):
-        if not AuthorizationService.the_authorizer:
+        authorizer = _the_authorizer
+        if not authorizer:
             # no authorizer - assume that authorization is not required
             return True, ""
-        return AuthorizationService.the_authorizer.authorize(ctx)
+        return authorizer.authorize(ctx)
@@ -61,7 +61,7 @@ class FLAuthorizer(Authorizer):
 
         """
         assert isinstance(policy_config, dict), "policy_config must be a dict but got {}".format(type(policy_config))
-        Authorizer.__init__(self, for_org, COMMAND_CATEGORIES)
+        Authorizer.__init__(self, for_org, COMMAND_CATEGORIES, cache_decisions=True)
         err = self.load_policy(policy_config)
         if err:
             raise SyntaxError("invalid policy config: {}".format(err))
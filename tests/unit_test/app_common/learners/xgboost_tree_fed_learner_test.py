@@ -0,0 +1,86 @@
+# Copyright (c) 2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+
+import numpy as np
+import pytest
+
+xgb = pytest.importorskip("xgboost")
+pytest.importorskip("torch.utils.tensorboard")
+
+from nvflare.app_common.learners.xgboost_tree_fed_learner import XGBoostTreeFedLearner  # noqa: E402
+
+
+class CsvLearner(XGBoostTreeFedLearner):
+    def __init__(self):
+        super().__init__(training_mode="cyclic")
+        self.num_builds = 0
+
+    def build_dmatrix(self, src_path: str):
+        self.num_builds += 1
+        data = np.loadtxt(src_path, delimiter=",", ndmin=2)
+        return xgb.DMatrix(data[:, 1:], label=data[:, 0])
+
+    def load_data(self, fl_ctx):
+        pass
+
+
+class TestXGBoostTreeFedLearner:
+    @pytest.fixture
+    def csv_path(self, tmp_path):
+        path = str(tmp_path / "data.csv")
+        np.savetxt(path, np.array([[0, 1.0, 2.0], [1, 3.0, 4.0], [0, 5.0, 6.0]]), delimiter=",")
+        return path
+
+    def test_load_or_cache_dmatrix(self, csv_path, tmp_path):
+        learner = CsvLearner()
+        cache_path = str(tmp_path / "data.buffer")
+
+        dmat = learner._load_or_cache_dmatrix(csv_path, cache_path, learner.build_dmatrix)
+        assert learner.num_builds == 1
+        assert os.path.isfile(cache_path)
+
+        cached = learner._load_or_cache_dmatrix(csv_path, cache_path, learner.build_dmatrix)
+        assert learner.num_builds == 1
+        assert (cached.num_row(), cached.num_col()) == (dmat.num_row(), dmat.num_col())
+        np.testing.assert_array_equal(cached.get_label(), dmat.get_label())
+
+    def test_load_or_cache_dmatrix_rebuilds_stale_cache(self, csv_path, tmp_path):
+        learner = CsvLearner()
+        cache_path = str(tmp_path / "data.buffer")
+        learner._load_or_cache_dmatrix(csv_path, cache_path, learner.build_dmatrix)
+
+        np.savetxt(csv_path, np.array([[1, 7.0, 8.0]]), delimiter=",")
+        cache_mtime = os.path.getmtime(cache_path)
+        os.utime(csv_path, (cache_mtime + 10, cache_mtime + 10))
+
+        dmat = learner._load_or_cache_dmatrix(csv_path, cache_path, learner.build_dmatrix)
+        assert learner.num_builds == 2
+        assert dmat.num_row() == 1
+        assert xgb.DMatrix(cache_path).num_row() == 1
+
+    def test_load_or_cache_dmatrix_rebuilds_corrupt_cache(self, csv_path, tmp_path):
+        learner = CsvLearner()
+        cache_path = str(tmp_path / "data.buffer")
+        with open(cache_path, "wb") as f:
+            f.write(b"truncated")
+        src_mtime = os.path.getmtime(csv_path)
+        os.utime(cache_path, (src_mtime + 10, src_mtime + 10))
+
+        dmat = learner._load_or_cache_dmatrix(csv_path, cache_path, learner.build_dmatrix)
+        assert learner.num_builds == 1
+        assert dmat.num_row() == 3
+        assert xgb.DMatrix(cache_path).num_row() == 3
+        assert not os.path.exists(cache_path + ".tmp")
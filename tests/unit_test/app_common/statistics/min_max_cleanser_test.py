@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import numpy as np
 import pytest
 
 from nvflare.app_common.app_constant import StatisticsConstants as StC
@@ -59,6 +60,20 @@ class TestAddNoiseToMinMax:
         assert value_with_noise > compare_result[0]
         assert value_with_noise <= compare_result[1]
 
+    @pytest.mark.parametrize("value, noise_level, compare_result", MAX_TEST_CASES)
+    def test_max_values_noise_generator(self, value, noise_level, compare_result):
+        r = np.random.uniform(noise_level[0], noise_level[1], size=3)
+        values_with_noise = AddNoiseToMinMax._get_max_values(np.full(3, value, dtype=np.float64), r)
+        assert np.all(values_with_noise > compare_result[0])
+        assert np.all(values_with_noise <= compare_result[1])
+
+    @pytest.mark.parametrize("value, noise_level, compare_result", MIN_TEST_CASES)
+    def test_min_values_noise_generator(self, value, noise_level, compare_result):
+        r = np.random.uniform(noise_level[0], noise_level[1], size=3)
+        values_with_noise = AddNoiseToMinMax._get_min_values(np.full(3, value, dtype=np.float64), r)
+        assert np.all(values_with_noise > compare_result[0])
+        assert np.all(values_with_noise <= compare_result[1])
+
     @pytest.mark.parametrize("metrics, noise_level, compare_result", NOISE_TEST_CASES)
     def test_min_value_noise_generator(self, metrics, noise_level, compare_result):
         gen = AddNoiseToMinMax(noise_level[0], noise_level[1])
@@ -78,3 +93,11 @@ class TestAddNoiseToMinMax:
         for ds in max_metrics:
             for feature in max_metrics[ds]:
                 assert max_metrics[ds][feature] > compare_result[metric][ds][feature]
+
+    def test_zero_noise_level(self):
+        gen = AddNoiseToMinMax(0.0, 0.0)
+        metrics = {"min": {"train": {"age": 0, "edu": 4}}, "max": {"train": {"age": 0, "edu": -4}}}
+        metrics_with_noise, modified = gen.apply(metrics, "site-1")
+        assert modified
+        assert metrics_with_noise["min"]["train"] == {"age": -1e-5, "edu": 4.0}
+        assert metrics_with_noise["max"]["train"] == {"age": 1e-5, "edu": -4.0}
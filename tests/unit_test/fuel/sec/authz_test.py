@@ -0,0 +1,276 @@
+# Copyright (c) 2021-2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from nvflare.fuel.sec.authz import (
+    Authorizer,
+    AuthzContext,
+    Person,
+    _RoleRightConditions,
+    emit_policy_module,
+    parse_policy_config,
+)
+
+RIGHT_CATEGORIES = {
+    "upload_app": "manage_job",
+    "abort_job": "manage_job",
+    "view_job": "view",
+}
+
+POLICY = {
+    "format_version": "1.0",
+    "permissions": {
+        "project_admin": "any",
+        "org_admin": {
+            "manage_job": "o:site",
+            "abort_job": ["o:submitter", "n:submitter"],
+            "view": "any",
+            "shell": ["not o:nvidia", "not n:bob"],
+        },
+        "lead": {
+            "manage_job": "n:submitter",
+            "view": ["o:nvidia", "o:acme"],
+            "shell": "none",
+        },
+        "member": {"view": ["o:site", "not n:eve"]},
+    },
+}
+
+AUTHZ_TEST_CASES = [
+    # right, user, submitter, expected
+    ("upload_app", ("alice", "x", "project_admin"), None, True),
+    ("upload_app", ("alice", "nvidia", "org_admin"), None, True),
+    ("upload_app", ("alice", "acme", "org_admin"), None, False),
+    (" Upload_App", ("alice", "nvidia", "org_admin"), None, True),
+    ("abort_job", ("alice", "acme", "org_admin"), ("bob", "acme", "lead"), True),
+    ("abort_job", ("alice", "acme", "org_admin"), ("alice", "other", "lead"), True),
+    ("abort_job", ("alice", "acme", "org_admin"), ("bob", "other", "lead"), False),
+    ("view_job", ("alice", "acme", "org_admin"), None, True),
+    ("shell", ("alice", "acme", "org_admin"), None, True),
+    ("shell", ("alice", "nvidia", "org_admin"), None, False),
+    ("shell", ("bob", "acme", "org_admin"), None, False),
+    ("upload_app", ("bob", "acme", "lead"), ("bob", "nvidia", "lead"), True),
+    ("upload_app", ("bob", "acme", "lead"), ("carol", "acme", "lead"), False),
+    ("view_job", ("bob", "ACME ", "lead"), None, True),
+    ("view_job", ("bob", "other", "lead"), None, False),
+    ("shell", ("bob", "nvidia", "lead"), None, False),
+    ("view_job", ("dave", "nvidia", "member"), None, True),
+    ("view_job", ("eve", "nvidia", "member"), None, False),
+    ("view_job", ("dave", "acme", "member"), None, False),
+    ("view_job", ("dave", "acme", ["member", "lead"]), None, True),
+    ("unknown_right", ("dave", "nvidia", "member"), None, False),
+    ("upload_app", ("dave", "nvidia", "unknown_role"), None, False),
+    ("shell", ("dave", "nvidia", "super"), None, True),
+]
+
+
+CONDITION_TEST_CASES = [
+    # expression, user, submitter, expected
+    ("o:site", ("alice", "nvidia", "lead"), None, True),
+    ("o:site", ("alice", "acme", "lead"), None, False),
+    ("org:submitter", ("alice", "acme", "lead"), ("bob", "acme", "lead"), True),
+    ("o:acme", ("alice", "acme", "lead"), None, True),
+    ("n:submitter", ("alice", "acme", "lead"), ("alice", "nvidia", "lead"), True),
+    ("name:bob", ("alice", "acme", "lead"), None, False),
+    ("not o:acme", ("alice", "acme", "lead"), None, False),
+]
+
+LITERAL_SET_TEST_CASES = [
+    # expression, user, expected
+    (["o:acme", "o:nvidia", "n:bob"], ("alice", "nvidia", "lead"), True),
+    (["o:acme", "o:nvidia", "n:bob"], ("bob", "other", "lead"), True),
+    (["o:acme", "o:nvidia", "n:bob"], ("alice", "other", "lead"), False),
+    (["n:alice", "n:bob", "not o:acme", "not o:other"], ("alice", "other", "lead"), False),
+    (["n:alice", "n:bob", "not o:acme", "not o:other"], ("bob", "nvidia", "lead"), True),
+    (["n:alice", "n:bob", "not o:acme", "not o:other"], ("carol", "nvidia", "lead"), False),
+]
+
+FLAG_TEST_CASES = [
+    # expression, allow_all, deny_all, user org, expected
+    ("any", True, False, "acme", True),
+    (["o:nvidia", "all"], True, False, "acme", True),
+    (["any", "not o:acme"], True, False, "acme", False),
+    (["any", "not o:acme"], True, False, "nvidia", True),
+    (["o:acme", "not any"], False, True, "acme", False),
+    ("none", False, False, "acme", False),
+]
+
+
+class TestAuthzContext:
+    def test_attrs(self):
+        ctx = AuthzContext(right="view", user=Person("alice", "acme", "lead"))
+        assert ctx.get_attr("job_id") is None
+        assert ctx.get_attr("job_id", "none") == "none"
+        ctx.set_attr("job_id", "123")
+        assert ctx.get_attr("job_id") == "123"
+
+
+class TestRoleRightConditions:
+    @pytest.mark.parametrize("exp, user, submitter, expected", CONDITION_TEST_CASES)
+    def test_condition_evaluators(self, exp, user, submitter, expected):
+        conds = _RoleRightConditions()
+        assert not conds.parse_expression(exp)
+        ctx = AuthzContext(right="view", user=Person(*user), submitter=Person(*submitter) if submitter else None)
+        evaluators = conds.allowed_conditions + conds.blocked_conditions
+        assert len(evaluators) == 1
+        matched = evaluators[0].evaluate("nvidia", ctx)
+        assert matched == (expected if conds.allowed_conditions else not expected)
+        assert conds.evaluate("nvidia", ctx) == expected
+
+    @pytest.mark.parametrize("exp, allow_all, deny_all, org, expected", FLAG_TEST_CASES)
+    def test_allow_all_deny_all(self, exp, allow_all, deny_all, org, expected):
+        conds = _RoleRightConditions()
+        assert not conds.parse_expression(exp)
+        assert conds.allow_all == allow_all
+        assert conds.deny_all == deny_all
+        ctx = AuthzContext(right="view", user=Person("alice", org, "lead"))
+        assert conds.evaluate("nvidia", ctx) == expected
+
+    @pytest.mark.parametrize("exp, user, expected", LITERAL_SET_TEST_CASES)
+    def test_literal_conditions(self, exp, user, expected):
+        conds = _RoleRightConditions()
+        assert not conds.parse_expression(exp)
+        assert conds.evaluate("nvidia", AuthzContext(right="view", user=Person(*user))) == expected
+
+
+class TestAuthorizer:
+    @pytest.fixture
+    def authorizer(self):
+        authorizer = Authorizer(site_org="NVIDIA", right_categories=RIGHT_CATEGORIES, cache_decisions=True)
+        err = authorizer.load_policy(POLICY)
+        assert not err
+        return authorizer
+
+    @pytest.mark.parametrize("right, user, submitter, expected", AUTHZ_TEST_CASES)
+    def test_authorize(self, authorizer, right, user, submitter, expected):
+        ctx = AuthzContext(right=right, user=Person(*user), submitter=Person(*submitter) if submitter else None)
+        authorized, err = authorizer.authorize(ctx)
+        assert authorized == expected
+        assert bool(err) != expected
+
+    def test_no_policy(self):
+        authorizer = Authorizer(site_org="nvidia")
+        authorized, err = authorizer.authorize(AuthzContext(right="view_job", user=Person("a", "b", "member")))
+        assert not authorized
+        assert err == "policy not defined"
+
+    @pytest.mark.parametrize(
+        "config",
+        [
+            None,
+            {},
+            {"permissions": {"admin": "any"}},
+            {"format_version": "1.0"},
+            {"format_version": "1.0", "permissions": {"admin": "o:a:b"}},
+            {"format_version": "1.0", "permissions": {"admin": "x:nvidia"}},
+            {"format_version": "1.0", "permissions": {"admin": []}},
+            {"format_version": "1.0", "permissions": {"admin": {"view": 1}}},
+        ],
+    )
+    def test_bad_policy(self, config):
+        policy, err = parse_policy_config(config, RIGHT_CATEGORIES)
+        assert policy is None
+        assert err
+
+    def test_policy_rights_and_roles(self, authorizer):
+        policy = authorizer.get_policy()
+        assert policy.get_roles() == ["lead", "member", "org_admin", "project_admin"]
+        assert policy.get_rights() == ["*", "abort_job", "manage_job", "shell", "upload_app", "view", "view_job"]
+        assert policy.role_rights["org_admin"]["abort_job"] == ["o:submitter", "n:submitter"]
+
+    def test_decision_cache_reset_on_load_policy(self, authorizer):
+        ctx = AuthzContext(right="shell", user=Person("alice", "acme", "lead"))
+        assert authorizer.authorize(ctx) == (False, "user 'alice' is not authorized for 'shell'")
+        assert authorizer.authorize(ctx) == (False, "user 'alice' is not authorized for 'shell'")
+
+        err = authorizer.load_policy({"format_version": "1.0", "permissions": {"lead": "any"}})
+        assert not err
+        assert authorizer.authorize(ctx) == (True, "")
+
+    def test_decision_cache_opt_in(self, authorizer):
+        ctx = AuthzContext(right="shell", user=Person("alice", "acme", "lead"))
+        authorizer.authorize(ctx)
+        assert len(authorizer._decision_cache) == 1
+
+        uncached = Authorizer(site_org="NVIDIA", right_categories=RIGHT_CATEGORIES)
+        assert not uncached.load_policy(POLICY)
+        assert uncached.authorize(ctx) == authorizer.authorize(ctx)
+        assert not uncached._decision_cache
+
+    def test_decision_cache_disabled_when_evaluate_overridden(self):
+        class AttrAuthorizer(Authorizer):
+            def evaluate(self, ctx: AuthzContext):
+                return ctx.get_attr("allowed", False), ""
+
+        authorizer = AttrAuthorizer(site_org="nvidia", cache_decisions=True)
+        assert not authorizer.cache_decisions
+        ctx = AuthzContext(right="shell", user=Person("alice", "acme", "lead"))
+        assert not authorizer.authorize(ctx)[0]
+        ctx.set_attr("allowed", True)
+        assert authorizer.authorize(ctx) == (True, "")
+
+    def test_compiled_policy(self, authorizer, tmp_path):
+        path = str(tmp_path / "compiled_policy.py")
+        assert not emit_policy_module(authorizer.get_policy(), RIGHT_CATEGORIES, path)
+
+        compiled = Authorizer(site_org="NVIDIA", right_categories=RIGHT_CATEGORIES)
+        assert not compiled.load_compiled_policy(path, POLICY)
+        assert compiled.get_policy().get_rights() == authorizer.get_policy().get_rights()
+        for right, user, submitter, _ in AUTHZ_TEST_CASES:
+            ctx = AuthzContext(right=right, user=Person(*user), submitter=Person(*submitter) if submitter else None)
+            assert compiled.authorize(ctx) == authorizer.authorize(ctx)
+
+        # the module is not checked against a config or right categories it was not generated from
+        outdated = Authorizer(site_org="NVIDIA", right_categories=RIGHT_CATEGORIES)
+        assert outdated.load_compiled_policy(path, {"format_version": "1.0", "permissions": {"lead": "any"}})
+        assert outdated.load_compiled_policy(path, None)
+        other_categories = Authorizer(site_org="NVIDIA", right_categories={"upload_app": "manage_job"})
+        assert other_categories.load_compiled_policy(path, POLICY)
+        assert outdated.get_policy() is None
+        assert other_categories.get_policy() is None
+
+    def test_compiled_policy_invalid_module(self, tmp_path):
+        path = tmp_path / "compiled_policy.py"
+        path.write_text("X = 1\n")
+        authorizer = Authorizer(site_org="nvidia", right_categories=RIGHT_CATEGORIES)
+        assert (
+            authorizer.load_compiled_policy(str(path), POLICY) == f"compiled policy {path} is not a valid policy module"
+        )
+        assert authorizer.get_policy() is None
+
+    def test_compiled_policy_reemitted(self, tmp_path):
+        path = str(tmp_path / "compiled_policy.py")
+        ctx = AuthzContext(right="view_job", user=Person("alice", "acme", "lead"))
+        for decision in ["any", "none"]:
+            config = {"format_version": "1.0", "permissions": {"lead": decision}}
+            policy, err = parse_policy_config(config, RIGHT_CATEGORIES)
+            assert not err
+            assert not emit_policy_module(policy, RIGHT_CATEGORIES, path)
+
+            authorizer = Authorizer(site_org="nvidia", right_categories=RIGHT_CATEGORIES)
+            assert not authorizer.load_compiled_policy(path, config)
+            assert authorizer.authorize(ctx)[0] == (decision == "any")
+
+    def test_mixed_case_category_rights(self):
+        authorizer = Authorizer(site_org="nvidia", right_categories={"Upload_App": "Manage_Job"})
+        err = authorizer.load_policy({"format_version": "1.0", "permissions": {"lead": {"manage_job": "any"}}})
+        assert not err
+        for right in ["Upload_App", "upload_app"]:
+            ctx = AuthzContext(right=right, user=Person("u", "acme", "lead"))
+            assert authorizer.authorize(ctx) == (True, "")
+
+    def test_policy_evaluate_normalizes_site_org(self, authorizer):
+        ctx = AuthzContext(right="upload_app", user=Person("alice", "nvidia", "org_admin"))
+        assert authorizer.get_policy().evaluate(site_org=" NVIDIA", ctx=ctx) == (True, "")